@@ -1,2 +1,74 @@
-from .classes import *
-from .search_api import Search
+import importlib
+
+# names are resolved on first access (PEP 562) so that `import subitopy` doesn't pull aiohttp,
+# async_lru and asyncio in, they are only imported once something that needs them is used
+_lazy_names = {
+    "Advertiser": "classes",
+    "Item": "classes",
+    "ItemCollection": "classes",
+    "AsyncRequest": "utils",
+    "QueryParameters": "parameters",
+    "HTTPCache": "cache",
+    "SearchCache": "cache",
+    "CrawlCheckpoint": "crawl",
+    "CrawlReport": "crawl",
+    "PageFetchError": "errors",
+    "SearchTimeoutError": "errors",
+    "ProxyPool": "proxies",
+    "SearchQuery": "query",
+    "Category": "query",
+    "Region": "query",
+    "Sort": "query",
+    "AdType": "query",
+    "Condition": "query",
+    "Search": "search_api",
+    "SyncSearch": "sync_api",
+}
+
+_submodules = {
+    "cache",
+    "classes",
+    "crawl",
+    "dedup",
+    "errors",
+    "images",
+    "parameters",
+    "price_stats",
+    "proxies",
+    "query",
+    "search_api",
+    "sync_api",
+    "utils",
+}
+
+__all__ = list(_lazy_names)
+
+TYPE_CHECKING = False  # importing typing would cost more than the rest of the import
+if TYPE_CHECKING:
+    from .cache import HTTPCache, SearchCache
+    from .classes import Advertiser, Item, ItemCollection
+    from .crawl import CrawlCheckpoint, CrawlReport
+    from .errors import PageFetchError, SearchTimeoutError
+    from .parameters import QueryParameters
+    from .proxies import ProxyPool
+    from .query import AdType, Category, Condition, Region, SearchQuery, Sort
+    from .search_api import Search
+    from .sync_api import SyncSearch
+    from .utils import AsyncRequest
+
+
+def __getattr__(name: str):
+    if name in _lazy_names:
+        module = importlib.import_module(f".{_lazy_names[name]}", __name__)
+        value = getattr(module, name)
+    elif name in _submodules:
+        value = importlib.import_module(f".{name}", __name__)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    globals()[name] = value  # next accesses don't go through __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_lazy_names) | _submodules)
@@ -0,0 +1,337 @@
+import asyncio
+import copy
+import hashlib
+import json
+import sys
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable
+
+
+@dataclass
+class CacheEntry:
+    "a cached response body together with its validators"
+
+    data: Any
+    body_hash: bytes
+    etag: str | None = None
+    last_modified: str | None = None
+    derived: dict = field(default_factory=dict)  # values computed from data, e.g. parsed Items
+
+
+class HTTPCache:
+    "response level cache that revalidates with ETag/Last-Modified and skips parsing unchanged bodies"
+
+    def __init__(self, maxsize: int = 512) -> None:
+        """
+        Parameters
+        ----------
+        maxsize : int, optional
+            maximum number of responses kept, the least recently used one is evicted first, by default 512
+        """
+        self.maxsize = maxsize
+        self._entries: OrderedDict[tuple, CacheEntry] = OrderedDict()
+        self.hits = 0  # 304 or identical body, parsing was skipped
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    @staticmethod
+    def key(url: str, params: dict | None = None) -> tuple:
+        params = params or {}
+        return (str(url), tuple(sorted((str(k), str(v)) for k, v in params.items())))
+
+    def get(self, url: str, params: dict | None = None) -> CacheEntry | None:
+        entry = self._entries.get(self.key(url, params))
+        if entry is not None:
+            self._entries.move_to_end(self.key(url, params))
+        return entry
+
+    def conditional_headers(self, url: str, params: dict | None = None) -> dict:
+        "returns the If-None-Match/If-Modified-Since headers for a request, if a validator is known"
+        entry = self.get(url, params)
+        headers = {}
+        if entry is not None:
+            if entry.etag is not None:
+                headers["If-None-Match"] = entry.etag
+            if entry.last_modified is not None:
+                headers["If-Modified-Since"] = entry.last_modified
+        return headers
+
+    def not_modified(self, url: str, params: dict | None = None) -> Any:
+        "called on a 304 response, returns the cached parsed body"
+        entry = self.get(url, params)
+        if entry is None:
+            return None
+        self.hits += 1
+        return entry.data
+
+    def store(
+        self,
+        url: str,
+        params: dict | None,
+        body: bytes,
+        headers: dict,
+        loads: Callable[[bytes], Any] = json.loads,
+    ) -> Any:
+        """stores a response body and returns it parsed, the body is only parsed if its content changed
+
+        Parameters
+        ----------
+        url : str
+            request url
+        params : dict | None
+            request query
+        body : bytes
+            raw response body
+        headers : dict
+            response headers, used for the ETag and Last-Modified validators
+        loads : Callable[[bytes], Any], optional
+            function used to parse the body, by default json.loads
+
+        Returns
+        -------
+        Any
+            the parsed body
+        """
+        key = self.key(url, params)
+        body_hash = hashlib.blake2b(body, digest_size=16).digest()
+        entry = self._entries.get(key)
+
+        if entry is not None and entry.body_hash == body_hash:
+            self.hits += 1
+        else:
+            self.misses += 1
+            entry = CacheEntry(data=loads(body), body_hash=body_hash)
+            self._entries[key] = entry
+
+        entry.etag = headers.get("ETag", entry.etag)
+        entry.last_modified = headers.get("Last-Modified", entry.last_modified)
+
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+        return entry.data
+
+    def memoize(
+        self, url: str, params: dict | None, name: str, factory: Callable[[], Any]
+    ) -> Any:
+        """returns a value derived from the cached body of a response, computing it only once per body
+
+        Parameters
+        ----------
+        url : str
+            request url
+        params : dict | None
+            request query
+        name : str
+            name of the derived value
+        factory : Callable[[], Any]
+            computes the value, called only if the body changed since the last call
+
+        Returns
+        -------
+        Any
+            the derived value, the same object is returned to every call so it should be copied before being changed
+        """
+        entry = self.get(url, params)
+        if entry is None:
+            return factory()
+        if name not in entry.derived:
+            entry.derived[name] = factory()
+        return entry.derived[name]
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+def approx_size(obj: Any, _seen: set | None = None) -> int:
+    "rough estimate in bytes of the memory used by an object and everything it references"
+    if _seen is None:
+        _seen = set()
+    if id(obj) in _seen:
+        return 0
+    _seen.add(id(obj))
+
+    size = sys.getsizeof(obj)
+    if isinstance(obj, (str, bytes, int, float, bool)) or obj is None:
+        return size
+    if isinstance(obj, dict):
+        size += sum(
+            approx_size(k, _seen) + approx_size(v, _seen) for k, v in obj.items()
+        )
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(approx_size(x, _seen) for x in obj)
+    elif hasattr(obj, "__dict__"):
+        size += approx_size(vars(obj), _seen)
+    return size
+
+
+@dataclass
+class _SearchEntry:
+    value: tuple
+    kind: type  # list or ItemCollection, both can be built from a list
+    size: int
+    expires: float
+
+    def view(self):
+        # every caller gets its own copies, so filtering or changing a result never changes the cached one
+        return self.kind([_copy_result(x) for x in self.value])
+
+
+def _copy_result(value):
+    if isinstance(value, dict):
+        return copy.deepcopy(value)  # raw ad, made of nested dicts and lists
+    # Item, its copy has its own image scales, the Advertiser is shared as it's not meant to change
+    return copy.copy(value)
+
+
+class SearchCache:
+    "search results cache shared between Search instances, bounded by the memory used by the results"
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024, ttl: float = 1800) -> None:
+        """
+        Parameters
+        ----------
+        max_bytes : int, optional
+            approximate memory budget of the cached results, least recently used results are evicted first, by default 64MB
+        ttl : float, optional
+            seconds a result stays valid, by default 1800
+        """
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.currsize = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict[tuple, _SearchEntry] = OrderedDict()
+        self._pending: dict[tuple, asyncio.Future] = {}
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key: tuple):
+        return self._lookup(key) is not None
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+            "currsize": self.currsize,
+            "max_bytes": self.max_bytes,
+        }
+
+    def _lookup(self, key: tuple) -> _SearchEntry | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires < time.monotonic():
+            self._remove(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def _remove(self, key: tuple) -> None:
+        entry = self._entries.pop(key)
+        self.currsize -= entry.size
+
+    def put(self, key: tuple, result) -> _SearchEntry:
+        "stores a copy of a search result, a list of ads or an ItemCollection, and returns its cache entry"
+        items = result.Itemlist if hasattr(result, "Itemlist") else result
+        value = tuple(_copy_result(x) for x in items)
+        entry = _SearchEntry(
+            value=value,
+            kind=type(result),
+            size=approx_size(value),
+            expires=time.monotonic() + self.ttl,
+        )
+        if entry.size > self.max_bytes:
+            return entry
+
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = entry
+        self.currsize += entry.size
+
+        while self.currsize > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+        return entry
+
+    async def get_or_search(
+        self, key: tuple, search: Callable[[], Awaitable], coalesce: bool = True
+    ):
+        """returns a copy of the cached result for key, running search if it is missing.
+        Concurrent calls with the same key share a single search
+
+        Parameters
+        ----------
+        key : tuple
+            normalized search query
+        search : Callable[[], Awaitable]
+            coroutine function performing the search
+        coalesce : bool, optional
+            if set to False a missing result is always searched by this call, without waiting on
+            (or being waited on by) the searches of other calls, by default True
+
+        Returns
+        -------
+        list | ItemCollection
+            a copy of the search result
+        """
+        entry = self._lookup(key)
+        if entry is not None:
+            self.hits += 1
+            return entry.view()
+
+        if not coalesce:
+            self.misses += 1
+            return self.put(key, await search()).view()
+
+        pending = self._pending.get(key)
+        if pending is not None and pending.get_loop() is asyncio.get_running_loop():
+            self.hits += 1
+            try:
+                entry = await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                if not pending.cancelled():
+                    raise
+                # the search we were waiting on was cancelled, run our own
+                return await self.get_or_search(key, search)
+            return entry.view()
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._pending[key] = future
+        try:
+            result = await search()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()  # avoid "exception never retrieved" if nobody is waiting
+            raise
+        finally:
+            if self._pending.get(key) is future:
+                del self._pending[key]
+
+        entry = self.put(key, result)
+        future.set_result(entry)
+        return entry.view()
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.currsize = 0
+
+
+# used by every Search instance that is not given its own cache
+default_search_cache = SearchCache()
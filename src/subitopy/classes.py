@@ -1,10 +1,32 @@
 import datetime
-import statistics
+import functools
 from dataclasses import dataclass, field
 
-from async_lru import alru_cache
+TYPE_CHECKING = False  # importing typing would cost more than the rest of the import
+if TYPE_CHECKING:
+    import aiohttp
 
-from .utils import AsyncRequest
+    from .proxies import ProxyPool
+
+
+def _lazy_alru_cache(**cache_kwargs):
+    "same as async_lru.alru_cache, but async_lru (and asyncio) are only imported when the coroutine is first called"
+
+    def decorator(fn):
+        cached = None
+
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            nonlocal cached
+            if cached is None:
+                from async_lru import alru_cache
+
+                cached = alru_cache(**cache_kwargs)(fn)
+            return await cached(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
 
 
 @dataclass(unsafe_hash=True)
@@ -13,9 +35,34 @@ class Advertiser:
     user_id: int
     is_company: bool
 
-    @alru_cache(ttl=3600)  # we use maxsize=128 here so that if a page is scanned twice
-    async def get_feedback(self, limit: int = 30, page_n: int = 0, proxy=None):
-        asyncrequest = AsyncRequest(tries=3)
+    async def get_feedback(
+        self,
+        limit: int = 30,
+        page_n: int = 0,
+        proxy=None,
+        proxy_pool: "ProxyPool | None" = None,
+        session: "aiohttp.ClientSession | None" = None,
+        timeout: float | None = None,
+    ):
+        "feedback api response of the user, if timeout (in seconds) expires the requests are cancelled and TimeoutError is raised"
+        import asyncio
+
+        # the deadline is kept out of the cached call, so it's not part of the cache key
+        async with asyncio.timeout(timeout):
+            return await self._get_feedback(limit, page_n, proxy, proxy_pool, session)
+
+    @_lazy_alru_cache(ttl=3600)  # we use maxsize=128 here so that if a page is scanned twice
+    async def _get_feedback(
+        self,
+        limit: int = 30,
+        page_n: int = 0,
+        proxy=None,
+        proxy_pool: "ProxyPool | None" = None,
+        session: "aiohttp.ClientSession | None" = None,
+    ):
+        from .utils import AsyncRequest
+
+        asyncrequest = AsyncRequest(tries=3, proxy_pool=proxy_pool, session=session)
         user_type = "MEMBER" if not self.is_company else "COMPANY"
 
         url = f"https://feedback-api-subito.trust.advgo.net/public/users/sdrn:subito:user:{self.user_id}/feedback"
@@ -25,8 +72,7 @@ class Advertiser:
         tot_reviews = r["reputation"]["sourceCounts"][
             "MEMBER"
         ]  # depends if subito re implements automatic reviews in that case watch ["reputation"]["receivedCount"]
-        if tot_reviews > 30:
-            pages = int(tot_reviews / 30)
+        pages = int(tot_reviews / 30) if tot_reviews > 30 else 0
         for page in range(pages):
             query["page"] = page + 1
             new_r = await asyncrequest.get(url=url, params=query, proxy=proxy)
@@ -34,12 +80,12 @@ class Advertiser:
 
         return r
 
-    async def reviews(self):
-        r = await self.get_feedback()
+    async def reviews(self, timeout: float | None = None):
+        r = await self.get_feedback(timeout=timeout)
         return r["result"]
 
-    async def reputation(self):
-        r = await self.get_feedback()
+    async def reputation(self, timeout: float | None = None):
+        r = await self.get_feedback(timeout=timeout)
         return r["reputation"]
 
 
@@ -59,10 +105,19 @@ class Item:
     city: str
     advertiser: Advertiser
     images: tuple[str]
+    # every scale of every image, e.g. {"big": uri, "thumb": uri}
+    image_scales: tuple[dict[str, str]] = field(default=(), compare=False, repr=False)
 
     def __post_init__(self):
         self.sort_index = self.price
 
+    def __copy__(self):
+        "copy.copy also copies the image scales dicts, so changing the copy never changes the original"
+        new = object.__new__(Item)
+        new.__dict__.update(self.__dict__)
+        new.image_scales = tuple(dict(scales) for scales in self.image_scales)
+        return new
+
     def check_strings(
         self,
         search_everywhere: list[str] = [],
@@ -83,6 +138,21 @@ class Item:
 
         return True
 
+    def image_urls(self, scale: str = "big") -> tuple[str]:
+        "urls of the item images in the given scale, e.g. \"big\" or \"thumb\""
+        from .images import item_image_urls
+
+        return item_image_urls(self, scale)
+
+    async def fetch_images(
+        self, cache_dir: str, scale: str = "big", **fetcher_kwargs
+    ) -> dict:
+        "downloads the item images to cache_dir and returns their paths by url, see images.ImageFetcher. Search.fetch_images reuses the session of the search"
+        from .images import ImageFetcher
+
+        fetcher = ImageFetcher(cache_dir, **fetcher_kwargs)
+        return await fetcher.fetch_many(self.image_urls(scale))
+
 
 @dataclass
 class ItemCollection:
@@ -119,6 +189,8 @@ class ItemCollection:
         self.__post_init__()
 
     def stats(self):
+        import statistics
+
         if self.items_number > 0:
             items_number = self.items_number
             items_prices = [x.price for x in self.Itemlist]
@@ -139,6 +211,53 @@ class ItemCollection:
         else:
             raise KeyError("No items were passed")
 
+    async def fetch_images(
+        self, cache_dir: str, scale: str = "big", **fetcher_kwargs
+    ) -> dict:
+        "downloads the images of every item to cache_dir and returns their paths by url, see images.ImageFetcher. Search.fetch_images reuses the session of the search"
+        from .images import ImageFetcher
+
+        fetcher = ImageFetcher(cache_dir, **fetcher_kwargs)
+        urls = (url for item in self.Itemlist for url in item.image_urls(scale))
+        return await fetcher.fetch_many(urls)
+
+    def price_stats(
+        self,
+        trim: float = 0.1,
+        outliers: str | None = "iqr",
+        k: float | None = None,
+        exclude_zero: bool = True,
+        group_by: str | None = None,
+        **kwargs,
+    ) -> dict:
+        "robust statistics on the item prices, ignoring placeholder prices and outliers, see price_stats.price_stats"
+        from .price_stats import price_stats
+
+        return price_stats(
+            self.Itemlist,
+            trim=trim,
+            outliers=outliers,
+            k=k,
+            exclude_zero=exclude_zero,
+            group_by=group_by,
+            **kwargs,
+        )
+
+    def remove_price_outliers(
+        self, method: str = "iqr", k: float | None = None, exclude_zero: bool = True
+    ):
+        "removes items whose price is an outlier, and items without a price if exclude_zero is set to True"
+        from .price_stats import outlier_mask
+
+        keep = outlier_mask(
+            [item.price for item in self.Itemlist],
+            method=method,
+            k=k,
+            exclude_zero=exclude_zero,
+        )
+        self.Itemlist = [item for item, ok in zip(self.Itemlist, keep) if ok]
+        self.__post_init__()
+
     def order_by_price(self):
         self.Itemlist.sort()
 
@@ -212,3 +331,55 @@ class ItemCollection:
         self.Itemlist = [item for item in self.Itemlist if item.shipping == True]
 
         self.__post_init__()
+
+    def _duplicate_clusters(
+        self, threshold: float, same_advertiser_threshold: float, match_images: bool
+    ) -> list[list[int]]:
+        from .dedup import find_near_duplicates
+
+        return find_near_duplicates(
+            self.Itemlist,
+            threshold=threshold,
+            same_advertiser_threshold=same_advertiser_threshold,
+            match_images=match_images,
+        )
+
+    def near_duplicates(
+        self,
+        threshold: float = 0.8,
+        same_advertiser_threshold: float = 0.5,
+        match_images: bool = True,
+    ) -> list["ItemCollection"]:
+        "returns the groups of near duplicate items (reposts of the same ad), see dedup.find_near_duplicates"
+        clusters = self._duplicate_clusters(
+            threshold, same_advertiser_threshold, match_images
+        )
+        return [ItemCollection([self.Itemlist[i] for i in c]) for c in clusters]
+
+    def dedupe(
+        self,
+        threshold: float = 0.8,
+        same_advertiser_threshold: float = 0.5,
+        match_images: bool = True,
+        keep: str = "newest",
+    ):
+        "keeps one item for each group of near duplicates, the \"newest\" or the \"oldest\" one. This function will return the removed duplicates"
+        choices = {"newest": max, "oldest": min}
+        if keep not in choices:
+            raise ValueError(f"keep must be 'newest' or 'oldest', not {keep!r}")
+        choose = choices[keep]
+
+        clusters = self._duplicate_clusters(
+            threshold, same_advertiser_threshold, match_images
+        )
+        removed = set()
+        for cluster in clusters:
+            kept = choose(cluster, key=lambda i: self.Itemlist[i].date)
+            removed.update(i for i in cluster if i != kept)
+
+        duplicates = [item for i, item in enumerate(self.Itemlist) if i in removed]
+        self.Itemlist = [
+            item for i, item in enumerate(self.Itemlist) if i not in removed
+        ]
+        self.__post_init__()
+        return ItemCollection(duplicates)
@@ -0,0 +1,125 @@
+import asyncio
+import json
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+
+
+@dataclass
+class PageResult:
+    "outcome of the download of a single search page"
+
+    start: int
+    ads: list[dict] | None = None  # raw ads (shared with the HTTPCache, if any), None if the page failed
+    error: str | None = None  # reason of the last failure
+    attempts: int = 0
+    resumed: bool = False  # the page was taken from a checkpoint
+
+    @property
+    def ok(self) -> bool:
+        return self.ads is not None
+
+
+@dataclass
+class CrawlReport:
+    "result of a search together with the outcome of every page, in page order"
+
+    data: list = field(default_factory=list)  # list of ads or ItemCollection
+    pages: list[PageResult] = field(default_factory=list)
+    timed_out: bool = False  # the deadline expired before every page was downloaded
+
+    @property
+    def failed(self) -> list[PageResult]:
+        return [page for page in self.pages if not page.ok]
+
+    @property
+    def complete(self) -> bool:
+        return not self.failed
+
+
+class CrawlCheckpoint:
+    "ads of the pages completed by a search, so that a crawl interrupted or partially failed can be resumed"
+
+    def __init__(self, path: str | os.PathLike | None = None) -> None:
+        """
+        Parameters
+        ----------
+        path : str | os.PathLike | None, optional
+            JSON lines file the completed pages are appended to, it's loaded if it already exists.
+            If None the checkpoint is only kept in memory, by default None
+        """
+        self.path = Path(path) if path is not None else None
+        self.search_key: list | None = None
+        self.pages: dict[int, list[dict]] = {}
+        self._write_lock = asyncio.Lock()  # keeps the records written from threads whole
+
+        if self.path is not None and self.path.exists():
+            with open(self.path, "rb+") as f:
+                content = f.read()
+                # a crash while writing leaves at most a partial last line, it's cut off
+                # so that the next record doesn't get appended to it
+                complete = content.rfind(b"\n") + 1
+                if complete < len(content):
+                    f.truncate(complete)
+            for line in content[:complete].splitlines():
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if "search" in record:
+                    self.search_key = record["search"]
+                else:
+                    self.pages[record["start"]] = record["ads"]
+
+    def __contains__(self, start: int) -> bool:
+        return start in self.pages
+
+    def __getitem__(self, start: int) -> list[dict]:
+        return self.pages[start]
+
+    @property
+    def completed_starts(self) -> list[int]:
+        return sorted(self.pages)
+
+    def _append(self, record: dict) -> None:
+        if self.path is None:
+            return
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def bind(self, search_key: tuple) -> None:
+        """ties the checkpoint to a search, a checkpoint can only resume the search that created it
+
+        Parameters
+        ----------
+        search_key : tuple
+            key identifying the search, made of JSON serializable values
+
+        Raises
+        ------
+        ValueError
+            if the checkpoint belongs to a different search
+        """
+        key = json.loads(json.dumps(search_key))  # tuples become lists, as when loaded from the file
+        if self.search_key is None:
+            self.search_key = key
+            self._append({"search": key})
+        elif self.search_key != key:
+            raise ValueError("This checkpoint belongs to a different search")
+
+    def add(self, start: int, ads: list[dict]) -> None:
+        "records a completed page"
+        self.pages[start] = ads
+        self._append({"start": start, "ads": ads})
+
+    async def add_async(self, start: int, ads: list[dict]) -> None:
+        "same as add, but the record is written and synced in a thread so the downloads going on aren't blocked"
+        self.pages[start] = ads
+        if self.path is None:
+            return
+        async with self._write_lock:
+            await asyncio.to_thread(self._append, {"start": start, "ads": ads})
@@ -0,0 +1,174 @@
+import re
+import unicodedata
+
+_MASK64 = (1 << 64) - 1
+_NON_ALNUM = re.compile(r"[^0-9a-z]+")
+
+
+def normalize_text(text: str) -> str:
+    "lowercases text, strips accents and punctuation and collapses whitespace"
+    # after NFKD accents are separate non ascii characters, dropped by the ascii encoding
+    text = unicodedata.normalize("NFKD", text.casefold())
+    text = text.encode("ascii", "ignore").decode("ascii")
+    return _NON_ALNUM.sub(" ", text).strip()
+
+
+def shingles(text: str) -> set[int]:
+    "hashed word bigrams of the normalized text, single words if the text has only one"
+    words = normalize_text(text).split()
+    if len(words) < 2:
+        return {hash(w) & _MASK64 for w in words}
+    return {hash(pair) & _MASK64 for pair in zip(words, words[1:])}
+
+
+def minhash_signature(hashes: set[int], num_perm: int = 64) -> tuple[int] | None:
+    """one permutation MinHash of a set of hashed shingles, densified by rotation.
+    A single pass over the shingles is needed instead of one pass per permutation
+
+    Parameters
+    ----------
+    hashes : set[int]
+        64 bit hashes of the shingles
+    num_perm : int, optional
+        length of the signature, by default 64
+
+    Returns
+    -------
+    tuple[int] | None
+        the signature, None if there are no shingles
+    """
+    if not hashes:
+        return None
+
+    empty = _MASK64
+    signature = [empty] * num_perm
+    for h in hashes:
+        b = h % num_perm
+        v = h // num_perm
+        if v < signature[b]:
+            signature[b] = v
+
+    # empty bins borrow the value of the next non empty bin, shifted by the distance
+    if empty in signature:
+        offset = _MASK64 // num_perm + 1
+        dense = list(signature)
+        for b in range(num_perm):
+            distance = 0
+            while signature[(b + distance) % num_perm] == empty:
+                distance += 1
+            if distance:
+                dense[b] = signature[(b + distance) % num_perm] + distance * offset
+        signature = dense
+
+    return tuple(signature)
+
+
+def signature_similarity(a: tuple[int], b: tuple[int]) -> float:
+    "estimated Jaccard similarity of the shingle sets of two signatures"
+    return sum(x == y for x, y in zip(a, b)) / len(a)
+
+
+class _DisjointSet:
+    def __init__(self, n: int) -> None:
+        self.parent = list(range(n))
+
+    def find(self, x: int) -> int:
+        parent = self.parent
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    def union(self, a: int, b: int) -> None:
+        ra, rb = self.find(a), self.find(b)
+        if ra != rb:
+            self.parent[max(ra, rb)] = min(ra, rb)
+
+
+def find_near_duplicates(
+    items: list,
+    threshold: float = 0.8,
+    same_advertiser_threshold: float = 0.5,
+    match_images: bool = True,
+    num_perm: int = 64,
+    bands: int = 16,
+    max_bucket_size: int = 32,
+) -> list[list[int]]:
+    """groups near duplicate Item objects, e.g. ads reposted under a new item_id or in another region.
+    Candidates are found with an LSH index over MinHash signatures of name and description,
+    so the running time grows almost linearly with the number of items
+
+    Parameters
+    ----------
+    items : list
+        Item objects to compare
+    threshold : float, optional
+        estimated Jaccard similarity of name and description above which two items are duplicates, by default 0.8
+    same_advertiser_threshold : float, optional
+        similarity threshold used when both items were posted by the same advertiser, by default 0.5
+    match_images : bool, optional
+        if set to True items sharing an image url are always duplicates, by default True
+    num_perm : int, optional
+        length of the MinHash signatures, by default 64
+    bands : int, optional
+        number of LSH bands, num_perm must be a multiple of it, by default 16
+    max_bucket_size : int, optional
+        maximum number of distinct clusters compared in a single LSH bucket, bounds the cost of very common texts, by default 32
+
+    Returns
+    -------
+    list[list[int]]
+        indexes of the duplicate items, one list per cluster with at least two items, in order of appearance
+
+    Raises
+    ------
+    ValueError
+        if num_perm is not a multiple of bands
+    """
+    if num_perm % bands != 0:
+        raise ValueError("num_perm must be a multiple of bands")
+    rows = num_perm // bands
+
+    clusters = _DisjointSet(len(items))
+    signatures = [
+        minhash_signature(shingles(f"{item.name} {item.description}"), num_perm)
+        for item in items
+    ]
+    buckets: dict[tuple, list[int]] = {}
+    image_owner: dict[str, int] = {}
+
+    for i, item in enumerate(items):
+        if match_images:
+            for image in item.images:
+                owner = image_owner.setdefault(image, i)
+                if owner != i:
+                    clusters.union(owner, i)
+
+        signature = signatures[i]
+        if signature is None:
+            continue
+        user_id = item.advertiser.user_id
+        for band in range(bands):
+            key = (band, signature[band * rows : (band + 1) * rows])
+            bucket = buckets.setdefault(key, [])
+            # a bucket keeps one item per cluster, so identical texts cost a single comparison
+            matched = False
+            for j in bucket:
+                if clusters.find(i) == clusters.find(j):
+                    matched = True
+                    continue
+                limit = (
+                    same_advertiser_threshold
+                    if items[j].advertiser.user_id == user_id
+                    else threshold
+                )
+                if signature_similarity(signature, signatures[j]) >= limit:
+                    clusters.union(i, j)
+                    matched = True
+            if not matched and len(bucket) < max_bucket_size:
+                bucket.append(i)
+
+    groups: dict[int, list[int]] = {}
+    for i in range(len(items)):
+        groups.setdefault(clusters.find(i), []).append(i)
+    return [group for group in groups.values() if len(group) > 1]
@@ -1 +1,13 @@
 class MunicipalityError(BaseException): ...
+
+
+class PageFetchError(Exception):
+    "raised when search pages could not be downloaded, report holds what was downloaded anyway"
+
+    def __init__(self, message: str, report=None) -> None:
+        super().__init__(message)
+        self.report = report
+
+
+class SearchTimeoutError(PageFetchError, TimeoutError):
+    "raised when a search exceeds its deadline, report holds what was downloaded before it expired"
@@ -0,0 +1,214 @@
+import datetime
+import math
+
+try:  # optional, used to vectorize the statistics when installed
+    import numpy as np
+except ImportError:
+    np = None
+
+DEFAULT_QUANTILES = (0.1, 0.25, 0.5, 0.75, 0.9)
+
+
+def _quantile(sorted_values: list[float], q: float) -> float:
+    # linear interpolation between the closest ranks, same as numpy's default method
+    position = (len(sorted_values) - 1) * q
+    low = math.floor(position)
+    high = math.ceil(position)
+    return sorted_values[low] + (sorted_values[high] - sorted_values[low]) * (
+        position - low
+    )
+
+
+def _outlier_bounds(
+    sorted_prices, method: str | None, k: float | None
+) -> tuple[float, float]:
+    if method is None:
+        return -math.inf, math.inf
+
+    if method == "iqr":
+        k = 1.5 if k is None else k
+        if np is not None:
+            q1, q3 = np.quantile(sorted_prices, (0.25, 0.75))
+        else:
+            q1, q3 = _quantile(sorted_prices, 0.25), _quantile(sorted_prices, 0.75)
+        return q1 - k * (q3 - q1), q3 + k * (q3 - q1)
+
+    if method == "mad":
+        k = 3.5 if k is None else k
+        if np is not None:
+            median = np.median(sorted_prices)
+            mad = np.median(np.abs(sorted_prices - median))
+        else:
+            median = _quantile(sorted_prices, 0.5)
+            mad = _quantile(sorted(abs(p - median) for p in sorted_prices), 0.5)
+        # 1.4826 makes the MAD a consistent estimator of the standard deviation
+        return median - k * 1.4826 * mad, median + k * 1.4826 * mad
+
+    raise ValueError(f"Unknown outlier method: {method}")
+
+
+def outlier_mask(
+    prices: list[float],
+    method: str | None = "iqr",
+    k: float | None = None,
+    exclude_zero: bool = True,
+) -> list[bool]:
+    """tells which prices should be kept
+
+    Parameters
+    ----------
+    prices : list[float]
+        prices to check
+    method : str | None, optional
+        "iqr" removes prices outside [Q1 - k*IQR, Q3 + k*IQR] (k defaults to 1.5),
+        "mad" removes prices more than k robust standard deviations from the median (k defaults to 3.5),
+        None keeps every price, by default "iqr"
+    k : float | None, optional
+        width of the accepted interval, by default None
+    exclude_zero : bool, optional
+        if set to True prices equal to 0, placeholders for ads without a price, are never kept
+        and don't take part in the outlier detection, by default True
+
+    Returns
+    -------
+    list[bool]
+        True for every price that should be kept
+
+    Raises
+    ------
+    ValueError
+        if the method is unknown
+    """
+    if np is not None:
+        values = np.asarray(prices, dtype=float)
+        valid = values > 0 if exclude_zero else np.ones(len(values), dtype=bool)
+        if not valid.any():
+            return [False] * len(prices)
+        low, high = _outlier_bounds(np.sort(values[valid]), method, k)
+        return (valid & (values >= low) & (values <= high)).tolist()
+
+    valid = [p for p in prices if p > 0 or not exclude_zero]
+    if not valid:
+        return [False] * len(prices)
+    low, high = _outlier_bounds(sorted(valid), method, k)
+    return [(p > 0 or not exclude_zero) and low <= p <= high for p in prices]
+
+
+def _summary(prices: list[float], days: list[float], trim: float, quantiles) -> dict:
+    n = len(prices)
+    if n == 0:
+        return {"tot_num": 0}
+    cut = int(n * trim)
+
+    if np is not None:
+        days = np.asarray(days, dtype=float)
+        price_per_day = np.asarray(prices, dtype=float) / np.maximum(days, 1)
+        values = np.sort(np.asarray(prices, dtype=float))
+        summary = {
+            "mean_price": float(values.mean()),
+            "trimmed_mean": float(values[cut : n - cut].mean()),
+            "median": float(np.median(values)),
+            "stdev": round(float(values.std(ddof=1)), 2) if n > 1 else None,
+            "mad": float(np.median(np.abs(values - np.median(values)))),
+            "iqr": float(np.subtract(*np.quantile(values, (0.75, 0.25)))),
+            "quantiles": dict(
+                zip(quantiles, (float(q) for q in np.quantile(values, quantiles)))
+            ),
+            "days_listed_median": float(np.median(days)),
+            "price_per_day_median": float(np.median(price_per_day)),
+        }
+    else:
+        price_per_day = [p / max(d, 1) for p, d in zip(prices, days)]
+        values = sorted(prices)
+        mean = math.fsum(values) / n
+        median = _quantile(values, 0.5)
+        summary = {
+            "mean_price": mean,
+            "trimmed_mean": math.fsum(values[cut : n - cut]) / (n - 2 * cut),
+            "median": median,
+            "stdev": (
+                round(math.sqrt(math.fsum((v - mean) ** 2 for v in values) / (n - 1)), 2)
+                if n > 1
+                else None
+            ),
+            "mad": _quantile(sorted(abs(v - median) for v in values), 0.5),
+            "iqr": _quantile(values, 0.75) - _quantile(values, 0.25),
+            "quantiles": {q: _quantile(values, q) for q in quantiles},
+            "days_listed_median": _quantile(sorted(days), 0.5),
+            "price_per_day_median": _quantile(sorted(price_per_day), 0.5),
+        }
+
+    summary["tot_num"] = n
+    summary["min"] = float(values[0])
+    summary["max"] = float(values[-1])
+    return summary
+
+
+def price_stats(
+    items: list,
+    trim: float = 0.1,
+    quantiles: tuple[float] = DEFAULT_QUANTILES,
+    outliers: str | None = "iqr",
+    k: float | None = None,
+    exclude_zero: bool = True,
+    group_by: str | None = None,
+    now: datetime.datetime | None = None,
+) -> dict:
+    """robust price statistics of a list of Item objects, uses NumPy when it's installed
+
+    Parameters
+    ----------
+    items : list
+        Item objects
+    trim : float, optional
+        fraction of the lowest and of the highest prices ignored by the trimmed mean, by default 0.1
+    quantiles : tuple[float], optional
+        quantiles to compute, by default (0.1, 0.25, 0.5, 0.75, 0.9)
+    outliers : str | None, optional
+        outlier removal method, "iqr", "mad" or None, see outlier_mask, by default "iqr"
+    k : float | None, optional
+        width of the accepted interval for the outlier removal, by default None
+    exclude_zero : bool, optional
+        if set to True items with a price of 0 (no price in the ad) are ignored, by default True
+    group_by : str | None, optional
+        Item attribute to group by, e.g. "condition", "city" or "shipping". Outliers are removed
+        within each group, by default None
+    now : datetime.datetime | None, optional
+        reference time for the days since an item was listed, by default datetime.datetime.now()
+
+    Returns
+    -------
+    dict
+        the statistics, with keys tot_num, excluded, mean_price, trimmed_mean, median, stdev, mad, iqr,
+        min, max, quantiles, days_listed_median and price_per_day_median. If group_by is passed
+        a dictionary with the statistics of each group is returned instead
+
+    Raises
+    ------
+    ValueError
+        if trim is not in [0, 0.5) or the outlier method is unknown
+    """
+    if not 0 <= trim < 0.5:
+        raise ValueError("trim must be in [0, 0.5)")
+    now = datetime.datetime.now() if now is None else now
+
+    # single pass over the items, everything else works on plain lists of numbers
+    groups: dict = {}
+    for item in items:
+        key = getattr(item, group_by) if group_by is not None else None
+        prices, days = groups.setdefault(key, ([], []))
+        prices.append(item.price)
+        days.append((now - item.date).total_seconds() / 86400)
+
+    results = {}
+    for key, (prices, days) in groups.items():
+        keep = outlier_mask(prices, method=outliers, k=k, exclude_zero=exclude_zero)
+        kept_prices = [p for p, ok in zip(prices, keep) if ok]
+        kept_days = [d for d, ok in zip(days, keep) if ok]
+        summary = _summary(kept_prices, kept_days, trim, quantiles)
+        summary["excluded"] = len(prices) - len(kept_prices)
+        results[key] = summary
+
+    if group_by is None:
+        return results.get(None, {"tot_num": 0, "excluded": 0})
+    return results
@@ -0,0 +1,164 @@
+import enum
+from dataclasses import dataclass
+from typing import Any, Callable
+
+from .errors import MunicipalityError
+from .parameters import QueryParameters
+
+
+def _members(options: type) -> dict:
+    # the empty placeholders ("" and 0) are represented by None in SearchQuery
+    return {
+        name: value
+        for name, value in vars(options).items()
+        if name.isupper() and name != "EMPTY"
+    }
+
+
+Category = enum.IntEnum("Category", _members(QueryParameters.Categories))
+Region = enum.IntEnum("Region", _members(QueryParameters.Regions))
+Sort = enum.StrEnum("Sort", _members(QueryParameters.Sort))
+AdType = enum.StrEnum("AdType", _members(QueryParameters.Ad_Type))
+Condition = enum.IntEnum("Condition", _members(QueryParameters.Conditions))
+
+
+def _normalize_text(value) -> str:
+    "lowercase text with single spaces, the api search is case insensitive"
+    return " ".join(str(value).lower().split())
+
+
+def _coerce(enum_type: type[enum.Enum], value, optional: bool = False):
+    "accepts an enum member, its value (also as a string) or its name, case insensitive"
+    if optional and value in (None, "", 0, "0"):
+        return None
+    if isinstance(value, enum_type):
+        return value
+    if isinstance(value, str):
+        text = value.strip()
+        if text.upper() in enum_type.__members__:
+            return enum_type[text.upper()]
+        value = int(text) if text.isdigit() and issubclass(enum_type, int) else text
+    try:
+        return enum_type(value)
+    except ValueError:
+        raise ValueError(f"{value!r} is not a valid {enum_type.__name__}") from None
+
+
+@dataclass(frozen=True)
+class SearchQuery:
+    """canonical form of the parameters of a search, equivalent searches build equal (and equally hashed) queries.
+    Every field accepts the same values as Search.search, they are normalized on creation"""
+
+    itemname: str
+    category: Category | None = None
+    page_results: int = 100
+    sort_by: Sort = Sort.DATE
+    ad_type: AdType = AdType.FOR_SALE
+    region: Region | None = None
+    titlesearch_only: bool = True
+    shipping_only: bool = False
+    municipality: str = ""
+    conditions: tuple[Condition] = ()
+
+    def __post_init__(self):
+        normalized = {
+            "itemname": _normalize_text(self.itemname),
+            "category": _coerce(Category, self.category, optional=True),
+            "page_results": int(self.page_results),
+            "sort_by": _coerce(Sort, self.sort_by),
+            "ad_type": _coerce(AdType, self.ad_type),
+            "region": _coerce(Region, self.region, optional=True),
+            "titlesearch_only": bool(self.titlesearch_only),
+            "shipping_only": bool(self.shipping_only),
+            "municipality": _normalize_text(self.municipality),
+            "conditions": tuple(
+                sorted({_coerce(Condition, c) for c in self.conditions})
+            ),
+        }
+        for name, value in normalized.items():
+            object.__setattr__(self, name, value)
+
+        if self.region is None and self.municipality:
+            raise MunicipalityError(
+                "Please specify the region where the municipality is located"
+            )
+
+    @property
+    def cache_key(self) -> tuple:
+        "stable key made of plain values, it doesn't depend on how the query was written"
+        return (
+            self.itemname,
+            None if self.category is None else int(self.category),
+            self.page_results,
+            str(self.sort_by),
+            str(self.ad_type),
+            None if self.region is None else int(self.region),
+            self.titlesearch_only,
+            self.shipping_only,
+            self.municipality,
+            tuple(int(c) for c in self.conditions),
+        )
+
+    def params(self, start: int = 0, lim: int | None = None) -> dict:
+        """query parameters for the search api
+
+        Parameters
+        ----------
+        start : int, optional
+            index of the first ad, by default 0
+        lim : int | None, optional
+            index after the last ad, by default start + page_results
+
+        Returns
+        -------
+        dict
+            the request query
+        """
+        return {
+            "q": self.itemname,
+            "c": "" if self.category is None else int(self.category),
+            "r": "" if self.region is None else int(self.region),
+            "to": self.municipality,
+            "t": str(self.ad_type),
+            "qso": str(self.titlesearch_only).lower(),
+            "shp": str(self.shipping_only).lower(),
+            "sort": str(self.sort_by),
+            "start": start,
+            "lim": start + self.page_results if lim is None else lim,
+            "ic": ",".join(str(int(c)) for c in self.conditions),
+        }
+
+
+@dataclass(frozen=True)
+class ItemFilter:
+    "conditions an Item must satisfy to be kept while a search is streaming its pages"
+
+    unsold_only: bool = False
+    min_price: int | None = None  # included
+    max_price: int | None = None  # included
+    predicate: Callable[[Any], bool] | None = None  # any other check, it must be hashable to cache the search
+
+    def __bool__(self):
+        return (
+            self.unsold_only
+            or self.min_price is not None
+            or self.max_price is not None
+            or self.predicate is not None
+        )
+
+    def __call__(self, item) -> bool:
+        if self.unsold_only and item.sold != "NO":
+            return False
+        if self.min_price is not None and item.price < self.min_price:
+            return False
+        if self.max_price is not None and item.price > self.max_price:
+            return False
+        return self.predicate is None or self.predicate(item)
+
+    def exhausted(self, item, sort_by: Sort) -> bool:
+        "tells if, given the sort order, no item after this one can pass the price checks"
+        if sort_by == Sort.LOWEST_PRICE and self.max_price is not None:
+            return item.price > self.max_price
+        if sort_by == Sort.HIGHEST_PRICE and self.min_price is not None:
+            return item.price < self.min_price
+        return False
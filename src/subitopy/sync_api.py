@@ -0,0 +1,266 @@
+import asyncio
+import concurrent.futures
+import os
+import threading
+from pathlib import Path
+
+import aiohttp
+
+from .classes import Advertiser, ItemCollection
+from .search_api import Search
+
+# extra time the blocking call waits after the deadline, so the coroutine can return its partial results
+_DEADLINE_GRACE = 1.0
+
+
+class SyncSearch:
+    "blocking wrapper for Search, every call runs on one background event loop sharing a single session"
+
+    def __init__(self, timeout: float | None = 60, **search_kwargs) -> None:
+        """
+        Parameters
+        ----------
+        timeout : float | None, optional
+            default number of seconds a call can block before raising TimeoutError, None waits forever, by default 60
+        **search_kwargs
+            arguments passed to Search, e.g. proxy, proxy_pool, http_cache or search_cache. session can't be
+            passed, the session is opened on the background loop
+
+        Raises
+        ------
+        ValueError
+            if a session is passed in search_kwargs
+
+        """
+        if "session" in search_kwargs:
+            raise ValueError(
+                "SyncSearch opens its own session on its event loop, a session can't be passed"
+            )
+        self.timeout = timeout
+        self._search_kwargs = search_kwargs
+        self._lock = threading.Lock()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._session: aiohttp.ClientSession | None = None
+        self._search: Search | None = None
+
+    def _start(self) -> None:
+        with self._lock:
+            if self._loop is not None:
+                return
+
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(
+                target=loop.run_forever, name="subitopy-loop", daemon=True
+            )
+            thread.start()
+
+            async def open_session() -> aiohttp.ClientSession:
+                # the session has to be created inside the loop that will use it
+                return aiohttp.ClientSession(raise_for_status=False)
+
+            self._session = asyncio.run_coroutine_threadsafe(
+                open_session(), loop
+            ).result()
+            self._search = Search(session=self._session, **self._search_kwargs)
+            self._loop = loop
+            self._thread = thread
+
+    def _run(self, coro, timeout: float | None = None):
+        if self._loop is None:
+            self._start()
+        if threading.current_thread() is self._thread:
+            coro.close()
+            raise RuntimeError("SyncSearch can't be used from its own event loop")
+
+        timeout = self.timeout if timeout is None else timeout
+        future = asyncio.run_coroutine_threadsafe(coro, self._loop)
+        try:
+            return future.result(timeout)
+        except concurrent.futures.TimeoutError:
+            if future.done():
+                raise  # the coroutine hit its own deadline, e.g. SearchTimeoutError
+            future.cancel()
+            raise TimeoutError(f"call did not complete in {timeout} seconds")
+
+    def _deadline(self, timeout: float | None) -> tuple[float | None, float | None]:
+        # deadline of the coroutine and time the caller blocks for
+        timeout = self.timeout if timeout is None else timeout
+        return timeout, None if timeout is None else timeout + _DEADLINE_GRACE
+
+    @property
+    def search_api(self) -> Search:
+        "the Search instance running on the background loop"
+        if self._search is None:
+            self._start()
+        return self._search
+
+    def search(
+        self, itemname: str, timeout: float | None = None, **kwargs
+    ) -> list | ItemCollection:
+        """blocking version of Search.search
+
+        Parameters
+        ----------
+        itemname : str
+            name of the item to research, it's the ad title
+        timeout : float | None, optional
+            seconds to wait for the results, if None the instance timeout is used. It's also the
+            deadline of the search, so with allow_partial the results downloaded in time are returned, by default None
+        **kwargs
+            other arguments accepted by Search.search
+
+        Returns
+        -------
+        list | ItemCollection
+            the search results
+
+        Raises
+        ------
+        TimeoutError
+            if the search did not complete in time, the search is cancelled
+
+        """
+        deadline, wait = self._deadline(timeout)
+        return self._run(
+            self.search_api.search(itemname=itemname, timeout=deadline, **kwargs),
+            timeout=wait,
+        )
+
+    def search_many(
+        self,
+        queries: list[str | dict],
+        timeout: float | None = None,
+        return_exceptions: bool = False,
+    ) -> list:
+        """runs many searches concurrently and waits for all of them
+
+        Parameters
+        ----------
+        queries : list[str  |  dict]
+            item names or dictionaries of keyword arguments for Search.search
+        timeout : float | None, optional
+            seconds to wait for all the results, if None the instance timeout is used. It's also the deadline
+            of every search (unless a query sets its own timeout), so the searches completed in time are kept
+            and, with allow_partial, the others return the results downloaded in time, by default None
+        return_exceptions : bool, optional
+            if set to True a failed search puts its exception in the results instead of raising it, e.g. the
+            SearchTimeoutError of a search that did not complete in time, by default False
+
+        Returns
+        -------
+        list
+            the results in the same order as queries
+
+        Raises
+        ------
+        TimeoutError
+            if a search did not complete in time and return_exceptions is False
+
+        """
+        search = self.search_api
+        deadline, wait = self._deadline(timeout)
+        coros = [
+            search.search(**{"timeout": deadline, **q})
+            if isinstance(q, dict)
+            else search.search(itemname=q, timeout=deadline)
+            for q in queries
+        ]
+
+        async def gather():
+            tasks = [asyncio.ensure_future(coro) for coro in coros]
+            try:
+                return await asyncio.gather(*tasks, return_exceptions=return_exceptions)
+            finally:
+                # when a search raises the others are not left running on the loop
+                for task in tasks:
+                    task.cancel()
+
+        return self._run(gather(), timeout=wait)
+
+    def get_feedback(
+        self, advertiser: Advertiser, timeout: float | None = None, **kwargs
+    ) -> dict:
+        """blocking version of Advertiser.get_feedback using the shared session
+
+        Parameters
+        ----------
+        advertiser : Advertiser
+            the user whose feedback is fetched
+        timeout : float | None, optional
+            seconds to wait for the feedback, if None the instance timeout is used, by default None
+        **kwargs
+            other arguments accepted by Advertiser.get_feedback
+
+        Returns
+        -------
+        dict
+            the feedback api response
+        """
+        search = self.search_api
+        kwargs.setdefault("proxy_pool", search.proxy_pool)
+        kwargs.setdefault("proxy", search.proxy)
+        deadline, wait = self._deadline(timeout)
+        return self._run(
+            advertiser.get_feedback(session=self._session, timeout=deadline, **kwargs),
+            timeout=wait,
+        )
+
+    def fetch_images(
+        self,
+        items,
+        cache_dir: str | os.PathLike,
+        timeout: float | None = None,
+        **kwargs,
+    ) -> dict[str, Path]:
+        """blocking version of Search.fetch_images, the images are downloaded through the shared session
+
+        Parameters
+        ----------
+        items : Iterable[Item]
+            the items, e.g. an ItemCollection returned by search
+        cache_dir : str | os.PathLike
+            directory of the image cache
+        timeout : float | None, optional
+            seconds to wait for the downloads, if None the instance timeout is used, by default None
+        **kwargs
+            other arguments accepted by Search.fetch_images
+
+        Returns
+        -------
+        dict[str, Path]
+            path of every image in the cache, by url
+        """
+        return self._run(
+            self.search_api.fetch_images(items, cache_dir, **kwargs), timeout=timeout
+        )
+
+    def reviews(self, advertiser: Advertiser, timeout: float | None = None) -> list:
+        return self.get_feedback(advertiser, timeout=timeout)["result"]
+
+    def reputation(self, advertiser: Advertiser, timeout: float | None = None) -> dict:
+        return self.get_feedback(advertiser, timeout=timeout)["reputation"]
+
+    def close(self) -> None:
+        "closes the session and stops the background loop"
+        with self._lock:
+            if self._loop is None:
+                return
+            loop, thread = self._loop, self._thread
+
+            async def shutdown():
+                await self._session.close()
+                if self._search.proxy_pool is not None:
+                    await self._search.proxy_pool.close()
+
+            asyncio.run_coroutine_threadsafe(shutdown(), loop).result()
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+            loop.close()
+            self._loop = self._thread = self._session = self._search = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,140 @@
+import asyncio
+
+import pytest
+from aiohttp import web
+
+import subitopy
+
+
+@pytest.mark.asyncio
+async def test_search_cache_returns_copies(make_item):
+    cache = subitopy.SearchCache()
+
+    async def search_items():
+        items = [make_item(1, price=500), make_item(2, price=600)]
+        items[0].image_scales = ({"big": "https://img/1.jpg"},)
+        return subitopy.ItemCollection(items)
+
+    async def search_ads():
+        return [{"urn": "id:ad:1", "features": {"/price": {"values": [{"key": "500"}]}}}]
+
+    first = await cache.get_or_search(("items",), search_items)
+    first.Itemlist[0].price = -1
+    first.Itemlist[0].image_scales[0]["big"] = "MUTATED"
+    first.filter_prices(minprice=550, maxprice=1000)
+    second = await cache.get_or_search(("items",), search_items)
+
+    assert [item.price for item in second] == [500, 600]
+    assert second.Itemlist[0].image_scales[0]["big"] == "https://img/1.jpg"
+    assert second.Itemlist[0] is not first.Itemlist[0]
+
+    ads = await cache.get_or_search(("ads",), search_ads)
+    ads[0]["features"]["/price"]["values"][0]["key"] = "0"
+    ads = await cache.get_or_search(("ads",), search_ads)
+
+    assert ads[0]["features"]["/price"]["values"][0]["key"] == "500"
+    assert cache.stats()["hits"] == 2 and cache.stats()["misses"] == 2
+
+
+@pytest.mark.asyncio
+async def test_http_cache_revalidation(serve, make_ad):
+    requests = []
+
+    async def handler(request):
+        requests.append(request.headers.get("If-None-Match"))
+        if request.headers.get("If-None-Match") == '"v1"':
+            return web.Response(status=304, headers={"ETag": '"v1"'})
+        return web.json_response(
+            {
+                "count_all": 2,
+                "ads": [
+                    make_ad(1, price=500, images=("https://img/1.jpg",)),
+                    make_ad(2, price=600),
+                ],
+            },
+            headers={"ETag": '"v1"'},
+        )
+
+    app = web.Application()
+    app.router.add_get("/hades/v1/search/items", handler)
+    http_cache = subitopy.HTTPCache()
+    search = subitopy.Search(
+        base_url=await serve(app), api_version=1, http_cache=http_cache
+    )
+    parsed = []
+    parse = search.get_item_shortinfo
+    search.get_item_shortinfo = lambda ad: parsed.append(ad) or parse(ad)
+
+    first = await search.search("iphone")
+    first.Itemlist[0].price = -1
+    first.Itemlist[0].image_scales[0]["big"] = "MUTATED"
+    second = await search.search("iphone")
+
+    assert requests == [None, '"v1"']
+    assert len(parsed) == 2  # the unchanged page was not parsed again
+    assert http_cache.hits == 1 and http_cache.misses == 1
+    assert [item.price for item in second] == [500, 600]
+    assert second.Itemlist[0].image_scales[0]["big"] == "https://img/1.jpg"
+
+
+@pytest.mark.asyncio
+async def test_http_cache_body_changed_while_parsing(serve, make_ad):
+    version = {"etag": '"v1"', "price": 500}
+    second_page = asyncio.Event()
+
+    async def handler(request):
+        if request.query["start"] != "0":
+            await second_page.wait()
+            return web.json_response({"count_all": 2, "ads": []})
+        if request.headers.get("If-None-Match") == version["etag"]:
+            return web.Response(status=304, headers={"ETag": version["etag"]})
+        ads = [make_ad(1, price=version["price"])]
+        return web.json_response(
+            {"count_all": 2, "ads": ads}, headers={"ETag": version["etag"]}
+        )
+
+    app = web.Application()
+    app.router.add_get("/hades/v1/search/items", handler)
+    search = subitopy.Search(
+        base_url=await serve(app), api_version=1, http_cache=subitopy.HTTPCache()
+    )
+
+    # the first crawl downloads v1 but parses its pages only when the second one arrives
+    slow = asyncio.ensure_future(search.search("iphone", pages=2, page_results=1))
+    await asyncio.sleep(0.1)
+    version.update(etag='"v2"', price=999)
+    fast = await search.search("iphone", page_results=1)
+    second_page.set()
+    slow = await slow
+    revalidated = await search.search("iphone", page_results=1)
+
+    assert [item.price for item in slow] == [500]
+    assert [item.price for item in fast] == [999]
+    assert [item.price for item in revalidated] == [999]
+
+
+@pytest.mark.asyncio
+async def test_http_cache_raw_ads_are_copied(serve, make_ad):
+    async def handler(request):
+        if request.headers.get("If-None-Match") == '"v1"':
+            return web.Response(status=304, headers={"ETag": '"v1"'})
+        return web.json_response(
+            {"count_all": 1, "ads": [make_ad(1)]}, headers={"ETag": '"v1"'}
+        )
+
+    app = web.Application()
+    app.router.add_get("/hades/v1/search/items", handler)
+    search = subitopy.Search(
+        base_url=await serve(app), api_version=1, http_cache=subitopy.HTTPCache()
+    )
+
+    first = await search.search("iphone", short=False)
+    first[0]["subject"] = "MUTATED"
+    page = await search.get_page(subitopy.SearchQuery("iphone").params())
+    page[0]["geo"]["city"]["short_name"] = "MUTATED"
+    streamed = await search.search("iphone", short=False, limit=1)
+    second = await search.search("iphone", short=False)
+
+    assert second[0]["subject"] == streamed[0]["subject"] == "iPhone 14 n. 1"
+    assert second[0]["geo"]["city"]["short_name"] == "Roma"
+    assert search.http_cache.hits == 3
@@ -0,0 +1,89 @@
+import datetime
+import os
+import sys
+
+# Add the 'src' directory to the sys.path for module discovery
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+)
+
+import pytest
+import pytest_asyncio
+from aiohttp import web
+
+import subitopy
+
+
+@pytest.fixture
+def make_item():
+    "factory of Item objects, only the fields a test cares about need to be passed"
+
+    def make(
+        item_id: int,
+        name: str = "iPhone 14",
+        description: str = "",
+        price: int = 100,
+        date: datetime.datetime = datetime.datetime(2025, 1, 1),
+        condition: str = "Ottime",
+        user_id: int | None = None,
+        images: tuple[str] = (),
+    ) -> subitopy.Item:
+        return subitopy.Item(
+            item_id,
+            name=name,
+            description=description,
+            price=price,
+            url=f"https://www.subito.it/{item_id}.htm",
+            date=date,
+            condition=condition,
+            city="Roma",
+            sold="NO",
+            shipping=True,
+            advertiser=subitopy.Advertiser(
+                user_id=item_id if user_id is None else user_id, is_company=False
+            ),
+            images=images,
+        )
+
+    return make
+
+
+@pytest.fixture
+def make_ad():
+    "factory of raw ads in the format of the search api, as parsed by Search.get_item_shortinfo"
+
+    def make(item_id: int, price: int = 100, images: tuple[str] = ()) -> dict:
+        return {
+            "urn": f"id:ad:{item_id}",
+            "subject": f"iPhone 14 n. {item_id}",
+            "body": "",
+            "geo": {"city": {"short_name": "Roma"}},
+            "dates": {"display": "2025-01-01 10:00:00"},
+            "advertiser": {"user_id": item_id, "company": False},
+            "images": [
+                {"scale": [{"size": "big", "uri": uri}, {"size": "thumb", "uri": uri}]}
+                for uri in images
+            ],
+            "features": [{"uri": "/price", "values": [{"key": str(price)}]}],
+            "urls": {"default": f"https://www.subito.it/{item_id}.htm"},
+        }
+
+    return make
+
+
+@pytest_asyncio.fixture
+async def serve():
+    "starts an aiohttp application on localhost and returns its base url, it's stopped after the test"
+    runners = []
+
+    async def start(app: web.Application) -> str:
+        runner = web.AppRunner(app)
+        await runner.setup()
+        await web.TCPSite(runner, "127.0.0.1", 0).start()
+        runners.append(runner)
+        host, port = runner.addresses[0][:2]
+        return f"http://{host}:{port}"
+
+    yield start
+    for runner in runners:
+        await runner.cleanup()
@@ -0,0 +1,162 @@
+import asyncio
+import os
+import sys
+
+# Add the 'src' directory to the sys.path for module discovery
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+)
+
+import pytest
+from aiohttp import web
+
+import subitopy
+
+
+def test_checkpoint_resume(tmp_path):
+    path = tmp_path / "crawl.jsonl"
+    key = ("https://www.subito.it/hades/v1/search/items", ("iphone 14", None))
+
+    checkpoint = subitopy.CrawlCheckpoint(path)
+    checkpoint.bind(key)
+    checkpoint.add(0, [{"urn": "id:ad:1"}])
+    checkpoint.add(200, [{"urn": "id:ad:3"}])
+    with open(path, "a") as f:
+        f.write('{"start": 100, "ads": [')  # crashed while writing
+
+    resumed = subitopy.CrawlCheckpoint(path)
+    resumed.bind(key)
+
+    assert resumed.completed_starts == [0, 200]
+    assert resumed[200] == [{"urn": "id:ad:3"}]
+    assert 100 not in resumed
+    with pytest.raises(ValueError):
+        resumed.bind(("https://www.subito.it/hades/v1/search/items", ("ps5", None)))
+
+    # pages completed after resuming are not lost to the partial line
+    resumed.add(100, [{"urn": "id:ad:2"}])
+    resumed.add(300, [{"urn": "id:ad:4"}])
+    reloaded = subitopy.CrawlCheckpoint(path)
+
+    assert reloaded.completed_starts == [0, 100, 200, 300]
+    assert reloaded[100] == [{"urn": "id:ad:2"}]
+
+
+@pytest.mark.asyncio
+async def test_checkpoint_add_async(tmp_path):
+    path = tmp_path / "crawl.jsonl"
+    checkpoint = subitopy.CrawlCheckpoint(path)
+    checkpoint.bind(("https://www.subito.it/hades/v1/search/items", ("iphone 14",)))
+
+    ads = [{"urn": f"id:ad:{i}", "body": "x" * 1000} for i in range(100)]
+    starts = range(0, 2000, 100)
+    await asyncio.gather(*(checkpoint.add_async(start, ads) for start in starts))
+
+    assert subitopy.CrawlCheckpoint(path).completed_starts == list(starts)
+
+
+@pytest.mark.asyncio
+async def test_search_checkpoint(tmp_path):
+    search = subitopy.Search()
+    path = tmp_path / "crawl.jsonl"
+    data = await search.search(itemname="Iphone 14", pages=2, checkpoint=path)
+
+    assert len(subitopy.CrawlCheckpoint(path).completed_starts) == 2
+    assert len(data) > 101
+
+
+@pytest.mark.asyncio
+async def test_search_timeout(serve):
+    stalled = asyncio.Event()
+
+    async def handler(request):
+        start = int(request.query["start"])
+        if start >= 200:
+            await stalled.wait()  # the third page never arrives in time
+        return web.json_response(
+            {"count_all": 500, "ads": [{"n": start + i} for i in range(100)]}
+        )
+
+    app = web.Application()
+    app.router.add_get("/hades/v1/search/items", handler)
+    base_url = await serve(app)
+
+    try:
+        search = subitopy.Search(base_url=base_url, api_version=1)
+        data = await search.search(
+            "x", pages="all", short=False, timeout=0.5, allow_partial=True
+        )
+        assert len(data) == 200
+
+        with pytest.raises(subitopy.SearchTimeoutError) as error:
+            await search.search("x", pages="all", short=False, timeout=0.5)
+        assert error.value.report.timed_out
+        assert len(error.value.report.data) == 200
+        assert len(error.value.report.failed) == 3
+    finally:
+        stalled.set()
+
+
+@pytest.mark.asyncio
+async def test_cached_search_timeout(serve):
+    stalled = asyncio.Event()
+
+    async def handler(request):
+        start = int(request.query["start"])
+        if start >= 200:
+            await stalled.wait()
+        return web.json_response(
+            {"count_all": 500, "ads": [{"n": start + i} for i in range(100)]}
+        )
+
+    app = web.Application()
+    app.router.add_get("/hades/v1/search/items", handler)
+    base_url = await serve(app)
+
+    try:
+        search = subitopy.Search(
+            base_url=base_url, api_version=1, search_cache=subitopy.SearchCache()
+        )
+        with pytest.raises(subitopy.SearchTimeoutError) as error:
+            await search.search(
+                "x", pages="all", short=False, cached=True, timeout=0.5
+            )
+        assert error.value.report.timed_out
+        assert len(error.value.report.data) == 200
+
+        data = await search.search(
+            "x", pages="all", short=False, cached=True, timeout=0.5, allow_partial=True
+        )
+        assert len(data) == 200
+        assert len(search.search_cache) == 0  # incomplete results are not cached
+    finally:
+        stalled.set()
+
+
+@pytest.mark.asyncio
+async def test_crawl_retries_and_requeues_pages(serve, make_ad):
+    drops = {100: 2}  # dropped connections are retried by the request itself
+    errors = {200: 3}  # as many as the tries of a request, the page is queued again
+
+    async def handler(request):
+        start = int(request.query["start"])
+        if drops.get(start):
+            drops[start] -= 1
+            request.transport.close()  # the connection dies without a response
+        if errors.get(start):
+            errors[start] -= 1
+            raise web.HTTPServiceUnavailable()
+        return web.json_response(
+            {"count_all": 300, "ads": [make_ad(start + i) for i in range(100)]}
+        )
+
+    app = web.Application()
+    app.router.add_get("/hades/v1/search/items", handler)
+    search = subitopy.Search(base_url=await serve(app), api_version=1)
+    search.request.timeout = 0.01
+
+    report = await search.crawl(subitopy.SearchQuery("iphone"), pages=3)
+
+    assert report.complete and len(report.data) == 300
+    assert [page.attempts for page in report.pages] == [1, 1, 2]
+    assert drops[100] == 0
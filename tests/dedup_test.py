@@ -0,0 +1,65 @@
+import datetime
+
+import pytest
+
+import subitopy
+
+DESCRIPTION = (
+    "Vendo iPhone 14 128GB blu in ottime condizioni, batteria all'88%, "
+    "sempre usato con cover e pellicola. Scatola e cavo originali inclusi, "
+    "nessun graffio sullo schermo. Consegna a mano o spedizione."
+)
+
+
+def day(n):
+    return datetime.datetime(2025, 1, n)
+
+
+def test_dedupe_reposts(make_item):
+    collection = subitopy.ItemCollection(
+        [
+            make_item(1, "iPhone 14 128GB", DESCRIPTION, user_id=10, date=day(1)),
+            # same ad reposted by the same user with a small edit
+            make_item(2, "IPHONE 14 128 GB", DESCRIPTION + " Prezzo trattabile", user_id=10, date=day(5)),
+            # same text posted in another region by another account
+            make_item(3, "iPhone 14 128GB", DESCRIPTION, user_id=20, date=day(3)),
+            make_item(4, "Bicicletta da corsa", "Telaio in carbonio taglia 54", user_id=30),
+            make_item(5, "Bici da corsa", "Foto reale", user_id=40, images=("img-a",)),
+            make_item(6, "Bicicletta corsa carbonio", "Usata poco", user_id=50, images=("img-a",), date=day(2)),
+        ]
+    )
+
+    clusters = collection.near_duplicates()
+    removed = collection.dedupe()
+
+    assert sorted(sorted(i.item_id for i in c) for c in clusters) == [[1, 2, 3], [5, 6]]
+    assert sorted(i.item_id for i in collection) == [2, 4, 6]
+    assert sorted(i.item_id for i in removed) == [1, 3, 5]
+
+
+def test_dedupe_keeps_distinct_items(make_item):
+    collection = subitopy.ItemCollection(
+        [
+            make_item(1, "iPhone 14 128GB", DESCRIPTION, user_id=10),
+            make_item(2, "Samsung Galaxy S23", "Perfetto, con garanzia Italia", user_id=20),
+        ]
+    )
+
+    assert len(collection.dedupe()) == 0
+    assert len(collection) == 2
+
+
+def test_dedupe_keep(make_item):
+    collection = subitopy.ItemCollection(
+        [
+            make_item(1, "iPhone 14 128GB", DESCRIPTION, user_id=10, date=day(1)),
+            make_item(2, "iPhone 14 128GB", DESCRIPTION, user_id=10, date=day(2)),
+        ]
+    )
+
+    with pytest.raises(ValueError):
+        collection.dedupe(keep="bogus")
+    assert len(collection) == 2
+
+    collection.dedupe(keep="oldest")
+    assert [i.item_id for i in collection] == [1]
@@ -0,0 +1,108 @@
+import asyncio
+import hashlib
+from collections import Counter
+
+import aiohttp
+import pytest
+from aiohttp import web
+
+import subitopy
+from subitopy.images import ImageFetcher
+
+PICTURE = b"\x89PNG picture" * 10_000
+OTHER = b"\x89PNG other" * 10
+
+
+@pytest.mark.asyncio
+async def test_image_fetcher(serve, tmp_path):
+    requests = Counter()
+    bodies = {"a.png": PICTURE, "b.png": PICTURE, "c.png": OTHER, "d.png": OTHER}
+
+    async def handler(request):
+        name = request.match_info["name"]
+        requests[name] += 1
+        await asyncio.sleep(0.05)  # keeps concurrent downloads of the same url overlapping
+        if name not in bodies:
+            raise web.HTTPNotFound()
+        return web.Response(body=bodies[name], content_type="image/png")
+
+    app = web.Application()
+    app.router.add_get("/{name}", handler)
+    base_url = await serve(app)
+    url = {name: f"{base_url}/{name}" for name in (*bodies, "x.png")}
+
+    fetcher = ImageFetcher(tmp_path, concurrency=4, tries=1)
+    paths = await fetcher.fetch_many(
+        url[name] for name in ("a.png", "a.png", "b.png", "c.png", "x.png")
+    )
+
+    # the same picture behind two urls is stored once, named after its content
+    digest = hashlib.sha256(PICTURE).hexdigest()
+    assert paths[url["a.png"]] == paths[url["b.png"]]
+    assert paths[url["a.png"]] == tmp_path / "objects" / digest[:2] / f"{digest}.png"
+    assert paths[url["a.png"]].read_bytes() == PICTURE
+    assert fetcher.cached_path(url["c.png"]).read_bytes() == OTHER
+    assert list(fetcher.failed) == [url["x.png"]] and url["x.png"] not in paths
+    assert requests == {"a.png": 1, "b.png": 1, "c.png": 1, "x.png": 1}
+    assert not any((tmp_path / "tmp").iterdir())
+
+    # concurrent fetches of a url share one download, cached urls are not requested again
+    first, second = await asyncio.gather(
+        fetcher.fetch(url["d.png"]), fetcher.fetch(url["d.png"])
+    )
+    await ImageFetcher(tmp_path).fetch_many([url["a.png"], url["c.png"]])
+
+    assert first == second == paths[url["c.png"]]
+    assert requests["d.png"] == 1
+    assert requests["a.png"] == 1 and requests["c.png"] == 1
+
+
+@pytest.mark.asyncio
+async def test_search_fetch_images(serve, tmp_path, make_item):
+    sessions = []
+
+    async def handler(request):
+        sessions.append(request.headers.get("X-Session"))
+        return web.Response(body=PICTURE, content_type="image/png")
+
+    app = web.Application()
+    app.router.add_get("/{name}", handler)
+    base_url = await serve(app)
+    items = subitopy.ItemCollection(
+        [make_item(1, images=(f"{base_url}/a.png", f"{base_url}/b.png"))]
+    )
+
+    async with aiohttp.ClientSession(headers={"X-Session": "shared"}) as session:
+        search = subitopy.Search(session=session)
+        paths = await search.fetch_images(items, tmp_path)
+
+    assert len(paths) == 2
+    assert sessions == ["shared", "shared"]
+
+
+@pytest.mark.asyncio
+async def test_image_fetcher_cleans_up(serve, tmp_path):
+    async def handler(request):
+        response = web.StreamResponse()
+        await response.prepare(request)
+        try:
+            while True:  # an endless image, the download is cancelled halfway
+                await response.write(b"x" * 1024)
+                await asyncio.sleep(0.01)
+        except ConnectionResetError:
+            return response
+
+    app = web.Application()
+    app.router.add_get("/{name}", handler)
+    base_url = await serve(app)
+
+    with pytest.raises(ValueError):
+        ImageFetcher(tmp_path, tries=0)
+
+    fetcher = ImageFetcher(tmp_path, chunk_size=1024)
+    with pytest.raises(TimeoutError):
+        async with asyncio.timeout(0.2):
+            await fetcher.fetch(f"{base_url}/endless.png")
+
+    assert list((tmp_path / "tmp").iterdir()) == []
+    assert fetcher.cached_path(f"{base_url}/endless.png") is None
@@ -0,0 +1,49 @@
+import os
+import subprocess
+import sys
+
+SRC = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+
+
+def run_python(code: str, *flags: str) -> subprocess.CompletedProcess:
+    env = dict(os.environ, PYTHONPATH=SRC)
+    return subprocess.run(
+        [sys.executable, *flags, "-c", code],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def import_time_us(statement: str, module: str = "subitopy") -> int:
+    "cumulative import time of module reported by python -X importtime, in microseconds"
+    result = run_python(statement, "-X", "importtime")
+    for line in result.stderr.splitlines():
+        if line.rstrip().endswith(f"| {module}"):
+            return int(line.split("|")[1])
+    raise AssertionError(f"{module} not found in the importtime output")
+
+
+def test_import_is_lazy():
+    code = (
+        "import sys, subitopy\n"
+        "subitopy.QueryParameters, subitopy.ItemCollection, subitopy.Item\n"
+        "heavy = ('aiohttp', 'async_lru', 'asyncio', 'statistics')\n"
+        "print(','.join(m for m in heavy if m in sys.modules))\n"
+    )
+    assert run_python(code).stdout.strip() == ""
+
+
+def test_import_benchmark():
+    # relative to the search module (which imports aiohttp) in the same process, so it holds on any machine
+    light = min(import_time_us("import subitopy") for _ in range(3))
+    heavy = min(
+        import_time_us("import subitopy.search_api", "subitopy.search_api")
+        for _ in range(3)
+    )
+    print(
+        f"import subitopy: {light / 1000:.1f}ms, "
+        f"subitopy.search_api: {heavy / 1000:.1f}ms"
+    )
+    assert light < heavy
@@ -0,0 +1,50 @@
+import datetime
+
+import subitopy
+
+NOW = datetime.datetime(2025, 6, 1)
+
+
+def listed(days):
+    return NOW - datetime.timedelta(days=days)
+
+
+def test_price_stats_robust(make_item):
+    prices = [0, 0, 5, 480, 500, 500, 510, 520, 530, 9999]
+    collection = subitopy.ItemCollection(
+        [make_item(i, price=p, date=listed(10)) for i, p in enumerate(prices)]
+    )
+
+    stats = collection.price_stats(trim=0, now=NOW)
+
+    assert stats["excluded"] == 4  # two placeholder prices, a case and a typo
+    assert stats["tot_num"] == 6
+    assert stats["median"] == 505
+    assert stats["min"] == 480 and stats["max"] == 530
+    assert stats["days_listed_median"] == 10
+    assert stats["price_per_day_median"] == 50.5
+
+
+def test_price_stats_grouped(make_item):
+    collection = subitopy.ItemCollection(
+        [make_item(i, price=500 + i, date=listed(10)) for i in range(5)]
+        + [
+            make_item(10 + i, price=300 + i, date=listed(10), condition="Danneggiato")
+            for i in range(5)
+        ]
+    )
+
+    stats = collection.price_stats(group_by="condition", outliers="mad", now=NOW)
+
+    assert stats["Ottime"]["median"] == 502
+    assert stats["Danneggiato"]["quantiles"][0.5] == 302
+
+
+def test_remove_price_outliers(make_item):
+    collection = subitopy.ItemCollection(
+        [make_item(i, price=p) for i, p in enumerate([0, 490, 500, 510, 20000])]
+    )
+
+    collection.remove_price_outliers()
+
+    assert [item.price for item in collection] == [490, 500, 510]
@@ -0,0 +1,86 @@
+import asyncio
+import time
+
+import pytest
+
+import subitopy
+
+
+@pytest.mark.asyncio
+async def test_round_robin_and_exclude():
+    pool = subitopy.ProxyPool(["http://a:1", "http://b:1", "http://c:1"])
+
+    picked = []
+    for _ in range(4):
+        proxy = await pool.acquire()
+        picked.append(proxy.url)
+        pool.release(proxy, success=True)
+    assert picked == ["http://a:1", "http://b:1", "http://c:1", "http://a:1"]
+
+    # a retry never goes through a proxy that already failed the request
+    failed = (pool.proxies[1], pool.proxies[2])
+    proxy = await pool.acquire(exclude=failed)
+    assert proxy is pool.proxies[0]
+    pool.release(proxy, success=True)
+
+    # unless no other proxy is left
+    proxy = await pool.acquire(exclude=tuple(pool.proxies))
+    assert proxy in pool.proxies
+    pool.release(proxy, success=True)
+    assert all(p.in_flight == 0 for p in pool.proxies)
+
+
+@pytest.mark.asyncio
+async def test_ejection_and_cooldown():
+    pool = subitopy.ProxyPool(
+        ["http://a:1", "http://b:1"], max_failures=2, cooldown=0.2
+    )
+    bad, good = pool.proxies
+
+    for _ in range(2):
+        pool.release(await pool.acquire(exclude=(good,)), success=False)
+    assert pool.available() == [good]
+    assert bad.total_failures == 2 and bad.failures == 0
+
+    for _ in range(3):
+        proxy = await pool.acquire()
+        assert proxy is good
+        pool.release(proxy, success=True)
+
+    # with every proxy cooling down acquire waits for the first to come back
+    for _ in range(2):
+        pool.release(await pool.acquire(exclude=(bad,)), success=False)
+    start = time.monotonic()
+    proxy = await pool.acquire()
+    assert proxy is bad and time.monotonic() - start > 0.05
+    pool.release(proxy, success=True)
+
+
+@pytest.mark.asyncio
+async def test_least_loaded():
+    pool = subitopy.ProxyPool(
+        ["http://a:1", "http://b:1"], strategy=subitopy.ProxyPool.LEAST_LOADED
+    )
+
+    first = await pool.acquire()
+    second = await pool.acquire()
+    assert first is not second
+    pool.release(first, success=True)
+    assert await pool.acquire() is first
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_and_cancellation():
+    pool = subitopy.ProxyPool([None], rate_limit=10)
+    proxy = pool.proxies[0]
+
+    start = time.monotonic()
+    for _ in range(3):
+        pool.release(await pool.acquire(), success=True)
+    assert time.monotonic() - start >= 0.18  # 10 requests per second
+
+    # a request cancelled while waiting for its slot gives the reservation back
+    with pytest.raises(TimeoutError):
+        async with asyncio.timeout(0.01):
+            await pool.acquire()
+    assert proxy.in_flight == 0 and proxy.requests == 3
@@ -0,0 +1,66 @@
+import os
+import sys
+
+# Add the 'src' directory to the sys.path for module discovery
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+)
+
+import pytest
+
+import subitopy
+from subitopy.errors import MunicipalityError
+from subitopy.utils import QueryParameters
+
+
+def test_search_query_canonical():
+    query_1 = subitopy.SearchQuery(
+        "iPhone  14",
+        category="telefonia",
+        region=QueryParameters.Regions.EMPTY,
+        sort_by=QueryParameters.Sort.LOWEST_PRICE,
+        conditions=[30, "20", QueryParameters.Conditions.OTTIME],
+    )
+    query_2 = subitopy.SearchQuery(
+        "iphone 14",
+        category=12,
+        region="",
+        sort_by="LOWEST_PRICE",
+        conditions=(subitopy.Condition.COME_NUOVO, 30),
+    )
+
+    assert query_1 == query_2
+    assert hash(query_1) == hash(query_2)
+    assert query_1.cache_key == query_2.cache_key
+    assert query_1.params(start=100) == {
+        "q": "iphone 14",
+        "c": 12,
+        "r": "",
+        "to": "",
+        "t": "s",
+        "qso": "true",
+        "shp": "false",
+        "sort": "priceasc",
+        "start": 100,
+        "lim": 200,
+        "ic": "20,30",
+    }
+
+
+def test_search_query_validation():
+    with pytest.raises(MunicipalityError):
+        subitopy.SearchQuery("iphone 14", municipality="Roma")
+    with pytest.raises(ValueError):
+        subitopy.SearchQuery("iphone 14", category="not a category")
+
+    query = subitopy.SearchQuery("iphone 14", region="lazio", municipality="Roma")
+    assert query.region is subitopy.Region.LAZIO
+
+
+def test_search_query_municipality():
+    query_1 = subitopy.SearchQuery("iPhone 14", region="lazio", municipality="Roma")
+    query_2 = subitopy.SearchQuery("iphone 14 ", region="lazio", municipality=" roma")
+
+    assert query_1 == query_2
+    assert query_1.cache_key == query_2.cache_key
+    assert query_1.params()["to"] == "roma"
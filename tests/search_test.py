@@ -105,3 +105,84 @@ async def test_cached_search():
 
     assert len(data_now.Itemlist) > 1 and len(data_after.Itemlist) > 1
     assert delta_2 < delta_1
+
+
+@pytest.mark.asyncio
+async def test_search_proxy_pool():
+    pool = subitopy.ProxyPool([None], strategy=subitopy.ProxyPool.LEAST_LOADED)
+    search = subitopy.Search(proxy_pool=pool)
+    item = "Iphone 14"
+    data = await search.search(itemname=item, pages=2)
+    await pool.close()
+
+    assert len(data) > 101
+    assert pool.proxies[0].requests >= 2
+
+
+@pytest.mark.asyncio
+async def test_search_http_cache():
+    cache = subitopy.HTTPCache()
+    search = subitopy.Search(http_cache=cache)
+    item = "Iphone 14"
+    data_1 = await search.search(itemname=item)
+    data_2 = await search.search(itemname=item)
+
+    assert len(data_1) > 0 and len(data_2) > 0
+    assert len(cache) == 1
+    assert cache.hits + cache.misses == 2
+
+
+@pytest.mark.asyncio
+async def test_cached_search_shared_and_copied():
+    cache = subitopy.SearchCache()
+    search_1 = subitopy.Search(search_cache=cache)
+    search_2 = subitopy.Search(search_cache=cache)
+    item = "Iphone 14"
+
+    data_1 = await search_1.search(itemname=item, conditions=[30, 20], cached=True)
+    n_items = len(data_1)
+    data_1.filter_prices(minprice=0, maxprice=1)
+    data_2 = await search_2.search(itemname=item, conditions=[20, 30], cached=True)
+
+    assert len(data_2) == n_items
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+
+def test_sync_search():
+    item = "Iphone 14"
+    with subitopy.SyncSearch(timeout=60) as search:
+        data = search.search(itemname=item)
+        data_many = search.search_many([item, {"itemname": item, "pages": 2}])
+
+    assert len(data) > 0
+    assert len(data_many) == 2 and len(data_many[1]) > 101
+
+
+@pytest.mark.asyncio
+async def test_fetch_images(tmp_path):
+    search = subitopy.Search()
+    item = "Iphone 14"
+    data = await search.search(itemname=item, page_results=10)
+    paths = await data.fetch_images(tmp_path, scale="big", concurrency=4)
+
+    assert len(paths) > 0
+    assert all(path.exists() for path in paths.values())
+
+
+@pytest.mark.asyncio
+async def test_search_limit_and_filters():
+    search = subitopy.Search()
+    item = "Iphone 14"
+    data = await search.search(
+        itemname=item,
+        pages=5,
+        sort_by=subitopy.QueryParameters.Sort.LOWEST_PRICE,
+        shipping_only=True,
+        limit=50,
+        unsold_only=True,
+        min_price=1,
+        max_price=300,
+    )
+
+    assert 0 < len(data) <= 50
+    assert all(0 < i.price <= 300 and i.sold == "NO" and i.shipping for i in data)
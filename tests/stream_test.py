@@ -0,0 +1,49 @@
+import asyncio
+
+import pytest
+from aiohttp import web
+
+import subitopy
+
+
+@pytest.mark.asyncio
+async def test_limit_stops_early(serve, make_ad):
+    stalled = asyncio.Event()
+    requested = []
+
+    async def handler(request):
+        start = int(request.query["start"])
+        requested.append(start)
+        if start >= 200:
+            await stalled.wait()  # only the first two pages are needed
+        ads = [make_ad(start + i, price=start + i) for i in range(100)]
+        return web.json_response({"count_all": 1000, "ads": ads})
+
+    app = web.Application()
+    app.router.add_get("/hades/v1/search/items", handler)
+    search = subitopy.Search(base_url=await serve(app), api_version=1)
+
+    cancelled = []
+    get_page = search._fetch_page
+
+    async def tracked_get_page(query, *args, **kwargs):
+        try:
+            return await get_page(query, *args, **kwargs)
+        except asyncio.CancelledError:
+            cancelled.append(query["start"])
+            raise
+
+    search._fetch_page = tracked_get_page
+
+    try:
+        with pytest.raises(ValueError):
+            await search.search("iphone", pages="all", limit=0)
+
+        data = await search.search("iphone", pages="all", limit=150)
+
+        assert [item.item_id for item in data] == list(range(150))
+        # the pages downloaded ahead were cancelled as soon as the limit was reached
+        assert cancelled and all(start >= 200 for start in cancelled)
+        assert max(requested) < 200 + 100 * search.page_concurrency
+    finally:
+        stalled.set()
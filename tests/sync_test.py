@@ -0,0 +1,59 @@
+import asyncio
+import os
+import sys
+
+# Add the 'src' directory to the sys.path for module discovery
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+)
+
+import aiohttp
+import pytest
+from aiohttp import web
+
+import subitopy
+
+
+@pytest.mark.asyncio
+async def test_search_many_deadline(serve):
+    stalled = asyncio.Event()
+
+    async def handler(request):
+        start = int(request.query["start"])
+        if request.query["q"] == "slow" and start >= 100:
+            await stalled.wait()
+        return web.json_response(
+            {"count_all": 200, "ads": [{"n": start + i} for i in range(100)]}
+        )
+
+    app = web.Application()
+    app.router.add_get("/hades/v1/search/items", handler)
+    base_url = await serve(app)
+
+    try:
+        with subitopy.SyncSearch(base_url=base_url, api_version=1) as search:
+            queries = [
+                {"itemname": "fast", "pages": "all", "short": False},
+                {"itemname": "slow", "pages": "all", "short": False},
+            ]
+            # the blocking calls run in a thread, the server runs on this loop
+            fast, slow = await asyncio.to_thread(
+                search.search_many, queries, timeout=0.5, return_exceptions=True
+            )
+            assert len(fast) == 200
+            assert isinstance(slow, subitopy.SearchTimeoutError)
+
+            queries[1]["allow_partial"] = True
+            fast, slow = await asyncio.to_thread(
+                search.search_many, queries, timeout=0.5
+            )
+            assert len(fast) == 200 and len(slow) == 100
+    finally:
+        stalled.set()
+
+
+@pytest.mark.asyncio
+async def test_session_is_rejected():
+    async with aiohttp.ClientSession() as session:
+        with pytest.raises(ValueError):
+            subitopy.SyncSearch(session=session)